@@ -6,9 +6,23 @@ YouTube Video Q&A Interface
 import streamlit as st
 from vector_store import VectorStoreManager
 from query_engine import QueryEngine
-import time
 from datetime import datetime
+import functools
+import html
 import json
+import os
+import time
+
+# Minimum seconds between redraws of a streaming answer
+STREAM_UPDATE_INTERVAL = 0.05
+
+# Quick questions as (button label, question) pairs
+QUICK_QUESTIONS = (
+    ("📝 Summarize the video", "Summarize the video"),
+    ("🔑 What are the key points?", "What are the key points?"),
+    ("👥 Who is mentioned?", "Who is mentioned?"),
+    ("📚 What topics are discussed?", "What topics are discussed?")
+)
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -25,139 +39,17 @@ st.set_page_config(
 # CUSTOM CSS - FIXED VERSION
 # ============================================================================
 
-st.markdown("""
-<style>
-    /* Main header styling */
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        text-align: center;
-        color: #FF0000;
-        margin-bottom: 0.5rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    .sub-header {
-        text-align: center;
-        color: #888;
-        margin-bottom: 2rem;
-        font-size: 1.1rem;
-    }
-    
-    /* Fix chat message visibility - IMPORTANT */
-    .stChatMessage {
-        background-color: transparent !important;
-        padding: 10px;
-        margin: 5px 0;
-    }
-    
-    /* User messages */
-    [data-testid="stChatMessageContent"] {
-        background-color: rgba(240, 242, 246, 0.8);
-        border-radius: 10px;
-        padding: 15px;
-        color: #1e1e1e;
-    }
-    
-    /* Make chat text visible */
-    .stMarkdown p {
-        color: #1e1e1e !important;
-    }
-    
-    /* Info boxes */
-    .success-box {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        background-color: #d4edda;
-        border-left: 4px solid #28a745;
-        color: #155724;
-        margin: 1rem 0;
-    }
-    
-    .info-box {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        background-color: #d1ecf1;
-        border-left: 4px solid #17a2b8;
-        color: #0c5460;
-        margin: 1rem 0;
-    }
-    
-    .warning-box {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        background-color: #fff3cd;
-        border-left: 4px solid #ffc107;
-        color: #856404;
-        margin: 1rem 0;
-    }
-    
-    /* Sidebar styling */
-    .sidebar-section {
-        background-color: rgba(248, 249, 250, 0.5);
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-    }
-    
-    /* Button styling */
-    .stButton button {
-        border-radius: 5px;
-        font-weight: 500;
-    }
-    
-    /* Remove white background from main area */
-    .main .block-container {
-        background-color: transparent;
-        padding-top: 2rem;
-    }
-    
-    /* Chat input styling */
-    .stChatInputContainer {
-        border-top: 1px solid rgba(250, 250, 250, 0.2);
-        padding-top: 1rem;
-    }
-    
-    /* Expander styling for sources */
-    .streamlit-expanderHeader {
-        background-color: rgba(240, 242, 246, 0.5);
-        border-radius: 5px;
-    }
-    
-    /* Text area for sources */
-    .stTextArea textarea {
-        background-color: rgba(255, 255, 255, 0.05);
-        color: #e0e0e0;
-        border: 1px solid rgba(250, 250, 250, 0.2);
-    }
-    
-    /* FOOTER STYLING - NEW */
-    .footer-container {
-        text-align: center;
-        padding: 1.5rem;
-        background: rgba(255, 255, 255, 0.08);
-        border-radius: 12px;
-        margin: 1rem 0;
-    }
-    
-    .footer-container p {
-        color: rgb(255, 255, 255) !important;
-        margin: 0.5rem 0;
-    }
-    
-    .footer-container span {
-        color: rgb(255, 255, 255) !important;
-    }
-    
-    .footer-container strong {
-        color: rgb(255, 255, 255) !important;
-    }
-    
-    .footer-container b {
-        color: rgb(255, 255, 255) !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data(show_spinner=False)
+def load_css(path: str) -> str:
+    """Read the stylesheet from disk once per process"""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+# Styles must be emitted on every run: Streamlit drops elements a rerun doesn't re-emit
+st.markdown(
+    f"<style>{load_css(os.path.join(os.path.dirname(__file__), 'assets', 'styles.css'))}</style>",
+    unsafe_allow_html=True
+)
 
 
 # ============================================================================
@@ -169,6 +61,13 @@ def initialize_session_state():
     if "messages" not in st.session_state:
         st.session_state.messages = []
     
+    # Bumped on every change to messages so caches can compare one integer
+    if "messages_version" not in st.session_state:
+        st.session_state.messages_version = 0
+    
+    if "chat_export_cache" not in st.session_state:
+        st.session_state.chat_export_cache = None
+    
     if "vector_store_manager" not in st.session_state:
         st.session_state.vector_store_manager = None
     
@@ -190,41 +89,83 @@ initialize_session_state()
 # UTILITY FUNCTIONS
 # ============================================================================
 
-def export_chat_history():
-    """Export chat history as downloadable formats"""
-    if not st.session_state.messages:
-        return None, None
+@st.cache_resource(show_spinner=False)
+def get_vector_store_manager():
+    """Build the vector store manager (and its embedding client) once per process"""
+    return VectorStoreManager()
+
+def append_message(message: dict):
+    """Append a chat message and bump the messages version"""
+    st.session_state.messages.append(message)
+    st.session_state.messages_version += 1
+
+def clear_messages():
+    """Clear the chat history and bump the messages version"""
+    st.session_state.messages = []
+    st.session_state.messages_version += 1
+
+def _serialize_chat(messages: list) -> tuple:
+    """Serialize the chat history body for export"""
+    text_lines = []
+    
+    for msg in messages:
+        speaker = "You" if msg["role"] == "user" else "Assistant"
+        text_lines.append(f"{speaker}: {msg['content']}")
+        text_lines.append("-"*80)
+        text_lines.append("")
     
-    # JSON format
+    return list(messages), "\n".join(text_lines)
+
+def get_chat_export_body() -> tuple:
+    """Serialize the chat history, reusing the last result while the messages version is unchanged"""
+    version = st.session_state.messages_version
+    cached = st.session_state.chat_export_cache
+    if cached is None or cached[0] != version:
+        cached = (version, _serialize_chat(st.session_state.messages))
+        st.session_state.chat_export_cache = cached
+    return cached[1]
+
+def build_json_export(messages: list, video_id: str) -> str:
+    """Build the JSON export; runs on click, so it must not read session state"""
     chat_data = {
-        "video_id": st.session_state.current_video_id,
+        "video_id": video_id,
         "export_date": datetime.now().isoformat(),
-        "messages": st.session_state.messages
+        "messages": messages
     }
-    json_data = json.dumps(chat_data, indent=2)
-    
-    # Text format
+    return json.dumps(chat_data, indent=2)
+
+def build_text_export(text_body: str, video_id: str) -> str:
+    """Build the text export; runs on click, so it must not read session state"""
     text_lines = [
         f"YouTube Video Q&A - Chat History",
-        f"Video ID: {st.session_state.current_video_id}",
+        f"Video ID: {video_id}",
         f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
         "="*80,
-        ""
+        "",
+        text_body
     ]
-    
-    for msg in st.session_state.messages:
-        role = "You" if msg["role"] == "user" else "Assistant"
-        text_lines.append(f"{role}: {msg['content']}")
-        text_lines.append("-"*80)
-        text_lines.append("")
-    
-    text_data = "".join(text_lines)
-    
-    return json_data, text_data
+    return "\n".join(text_lines)
+
+@st.cache_data(show_spinner=False)
+def render_sources_html(sources: tuple) -> str:
+    """Build the escaped HTML for a message's source chunks once per unique set"""
+    blocks = []
+    for i, source in enumerate(sources, 1):
+        escaped = html.escape(source).replace("\n", "<br>")
+        blocks.append(
+            f'<p><strong>Chunk {i}:</strong></p>'
+            f'<div class="source-chunk">{escaped}</div>'
+        )
+    return "<hr>".join(blocks)
+
+def render_sources(sources: list):
+    """Show source chunks in an expander as a single markdown element"""
+    with st.expander("📄 View Source Chunks"):
+        st.markdown(render_sources_html(tuple(sources)), unsafe_allow_html=True)
 
 def reset_app():
     """Reset the entire application state"""
-    st.session_state.messages = []
+    clear_messages()
     st.session_state.vector_store_manager = None
     st.session_state.query_engine = None
     st.session_state.current_video_id = None
@@ -283,6 +224,15 @@ with st.sidebar:
             help="Number of relevant chunks to retrieve"
         )
         
+        ef_search = st.slider(
+            "Search depth",
+            min_value=16,
+            max_value=256,
+            value=64,
+            step=16,
+            help="HNSW efSearch: higher improves recall at the cost of speed"
+        )
+        
         show_sources = st.checkbox("Show source chunks", value=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
@@ -324,7 +274,7 @@ with st.sidebar:
     col1, col2 = st.columns(2)
     with col1:
         if st.button("🗑️ Clear Chat", use_container_width=True):
-            st.session_state.messages = []
+            clear_messages()
             st.rerun()
     
     with col2:
@@ -337,13 +287,16 @@ with st.sidebar:
         st.markdown("---")
         st.subheader("💾 Export Chat")
         
-        json_data, text_data = export_chat_history()
+        # Inputs are captured now; the callables run on click in a worker
+        # thread without access to session state
+        exported_messages, text_body = get_chat_export_body()
+        video_id = st.session_state.current_video_id
         
         col1, col2 = st.columns(2)
         with col1:
             st.download_button(
                 label="📄 TXT",
-                data=text_data,
+                data=functools.partial(build_text_export, text_body, video_id),
                 file_name=f"chat_{st.session_state.current_video_id}.txt",
                 mime="text/plain",
                 use_container_width=True
@@ -352,7 +305,7 @@ with st.sidebar:
         with col2:
             st.download_button(
                 label="📋 JSON",
-                data=json_data,
+                data=functools.partial(build_json_export, exported_messages, video_id),
                 file_name=f"chat_{st.session_state.current_video_id}.json",
                 mime="application/json",
                 use_container_width=True
@@ -363,19 +316,32 @@ with st.sidebar:
     # Quick Questions Section
     st.subheader("⚡ Quick Questions")
     
-    quick_questions = [
-        "📝 Summarize the video",
-        "🔑 What are the key points?",
-        "👥 Who is mentioned?",
-        "📚 What topics are discussed?"
-    ]
-    
-    for question in quick_questions:
-        display_text = question.split(" ", 1)[1]  # Remove emoji for clean question
-        if st.button(question, use_container_width=True, key=f"quick_{display_text}"):
-            st.session_state.messages.append({"role": "user", "content": display_text})
+    for label, display_text in QUICK_QUESTIONS:
+        if st.button(label, use_container_width=True, key=f"quick_{display_text}"):
+            append_message({"role": "user", "content": display_text})
             st.rerun()
     
+    if st.session_state.query_engine and st.button("🚀 Answer all", use_container_width=True, key="quick_all"):
+        questions = [display_text for _, display_text in QUICK_QUESTIONS]
+        
+        with st.spinner("🤔 Answering all quick questions..."):
+            results = st.session_state.query_engine.concurrent_batch_query(questions)
+        
+        for result in results:
+            append_message({"role": "user", "content": result['question']})
+            if result['success']:
+                append_message({
+                    "role": "assistant",
+                    "content": result['answer'],
+                    "sources": result['sources']
+                })
+            else:
+                append_message({
+                    "role": "assistant",
+                    "content": f"❌ {result['error']}"
+                })
+        st.rerun()
+    
     st.markdown("---")
     
     # Footer
@@ -395,7 +361,7 @@ if process_button and video_url:
     if st.session_state.vector_store_manager is None:
         with st.spinner("🔧 Initializing system..."):
             try:
-                st.session_state.vector_store_manager = VectorStoreManager()
+                st.session_state.vector_store_manager = get_vector_store_manager()
                 st.success("✓ System initialized!")
             except Exception as e:
                 st.error(f"❌ Failed to initialize system: {e}")
@@ -413,22 +379,19 @@ if process_button and video_url:
             progress_bar = st.progress(0)
             status_text = st.empty()
             
-            # Step 1: Fetch transcript
-            status_text.markdown("### 📥 Fetching transcript...")
-            progress_bar.progress(25)
-            time.sleep(0.5)
+            def update_progress(message, percent):
+                status_text.markdown(f"### {message}")
+                progress_bar.progress(percent)
             
-            result = st.session_state.vector_store_manager.process_video(video_url)
+            # Steps 1-2: Fetch transcript and create vector store
+            result = st.session_state.vector_store_manager.process_video(
+                video_url,
+                progress_cb=update_progress
+            )
             
             if result['success']:
-                # Step 2: Creating vector store
-                status_text.markdown("### 🧠 Creating knowledge base...")
-                progress_bar.progress(50)
-                time.sleep(0.5)
-                
                 # Step 3: Initialize query engine
-                status_text.markdown("### 🔗 Building query system...")
-                progress_bar.progress(75)
+                update_progress("🔗 Building query system...", 85)
                 
                 try:
                     st.session_state.query_engine = QueryEngine(
@@ -439,12 +402,11 @@ if process_button and video_url:
                     # Update session state
                     st.session_state.current_video_id = video_id
                     st.session_state.video_metadata = result['metadata']
-                    st.session_state.messages = []  # Clear chat for new video
+                    clear_messages()  # Clear chat for new video
                     
                     # Complete
                     status_text.markdown("### ✅ Ready to answer questions!")
                     progress_bar.progress(100)
-                    time.sleep(1)
                     
                     # Clear progress indicators
                     progress_bar.empty()
@@ -471,9 +433,10 @@ if process_button and video_url:
     else:
         st.error("❌ Invalid YouTube URL. Please check and try again.")
 
-# Update k value if changed
+# Update retrieval settings if changed
 if st.session_state.query_engine and k_value:
     st.session_state.query_engine.update_k(k_value)
+    st.session_state.query_engine.update_ef_search(ef_search)
 
 # ============================================================================
 # MAIN CHAT INTERFACE
@@ -484,6 +447,72 @@ if st.session_state.query_engine and k_value:
 # MAIN CHAT INTERFACE
 # ============================================================================
 
+@st.fragment
+def chat_panel(show_sources: bool):
+    """Render chat history and input; reruns on its own without the sidebar"""
+    # Display chat messages from history
+    for message in st.session_state.messages:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+            
+            # Show sources if available and enabled
+            if message["role"] == "assistant" and show_sources and message.get("sources"):
+                render_sources(message["sources"])
+    
+    # Chat input
+    if prompt := st.chat_input("💭 Ask a question about the video...", key="chat_input"):
+        # Add user message to chat history
+        append_message({"role": "user", "content": prompt})
+        
+        # Display user message
+        with st.chat_message("user"):
+            st.markdown(prompt)
+        
+        # Generate response
+        with st.chat_message("assistant"):
+            answer_placeholder = st.empty()
+            answer_placeholder.caption("🤔 Thinking...")
+            
+            try:
+                query_engine = st.session_state.query_engine
+                
+                # Streaming fast-path: plain text only, no markdown or sources,
+                # redrawn at most every STREAM_UPDATE_INTERVAL seconds
+                answer = ""
+                sources = []
+                last_update = 0.0
+                for chunk in query_engine.stream_query(prompt, on_sources=sources.extend):
+                    answer += chunk
+                    now = time.monotonic()
+                    if now - last_update >= STREAM_UPDATE_INTERVAL:
+                        answer_placeholder.text(answer)
+                        last_update = now
+                
+                # Final render with full markdown
+                answer_placeholder.markdown(answer)
+                
+                # Show sources if enabled
+                if show_sources and sources:
+                    render_sources(sources)
+                
+                # Add to chat history
+                append_message({
+                    "role": "assistant",
+                    "content": answer,
+                    "sources": sources
+                })
+            
+            except Exception as e:
+                error_msg = f"❌ Error processing query: {str(e)}"
+                answer_placeholder.error(error_msg)
+                append_message({
+                    "role": "assistant",
+                    "content": error_msg
+                })
+        
+        # Refresh the sidebar message count and export once the turn is recorded
+        st.rerun(scope="app")
+
 # Welcome message if no video loaded
 if not st.session_state.current_video_id:
     st.markdown("""
@@ -510,85 +539,7 @@ if not st.session_state.current_video_id:
         st.markdown("This is a sample video you can try!")
 
 else:
-    # Display chat messages from history
-    for msg_idx, message in enumerate(st.session_state.messages):
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
-            
-            # Show sources if available and enabled
-            if message["role"] == "assistant" and show_sources and "sources" in message:
-                with st.expander("📄 View Source Chunks"):
-                    for i, source in enumerate(message["sources"], 1):
-                        st.markdown(f"**Chunk {i}:**")
-                        st.text_area(
-                            f"Source {i}",
-                            value=source,
-                            height=150,
-                            key=f"source_msg{msg_idx}_chunk{i}",  # FIXED: Unique key with message index
-                            label_visibility="collapsed"
-                        )
-                        if i < len(message["sources"]):
-                            st.markdown("---")
-    
-    # Chat input
-    if prompt := st.chat_input("💭 Ask a question about the video...", key="chat_input"):
-        # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        
-        # Display user message
-        with st.chat_message("user"):
-            st.markdown(prompt)
-        
-        # Generate response
-        with st.chat_message("assistant"):
-            with st.spinner("🤔 Thinking..."):
-                try:
-                    # Query the video
-                    result = st.session_state.query_engine.query(prompt)
-                    
-                    if result['success']:
-                        answer = result['answer']
-                        sources = result['sources']
-                        
-                        # Display answer
-                        st.markdown(answer)
-                        
-                        # Show sources if enabled
-                        if show_sources and sources:
-                            with st.expander("📄 View Source Chunks"):
-                                for i, source in enumerate(sources, 1):
-                                    st.markdown(f"**Chunk {i}:**")
-                                    st.text_area(
-                                        f"Source {i}",
-                                        value=source,
-                                        height=150,
-                                        key=f"source_current_chunk{i}_{time.time()}",  # FIXED: Unique key with timestamp
-                                        label_visibility="collapsed"
-                                    )
-                                    if i < len(sources):
-                                        st.markdown("---")
-                        
-                        # Add to chat history
-                        st.session_state.messages.append({
-                            "role": "assistant",
-                            "content": answer,
-                            "sources": sources
-                        })
-                    else:
-                        error_msg = f"❌ {result['error']}"
-                        st.error(error_msg)
-                        st.session_state.messages.append({
-                            "role": "assistant",
-                            "content": error_msg
-                        })
-                
-                except Exception as e:
-                    error_msg = f"❌ Unexpected error: {str(e)}"
-                    st.error(error_msg)
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": error_msg
-                    })
+    chat_panel(show_sources)
 # ============================================================================
 # FOOTER - UPDATED
 # ============================================================================
@@ -5,9 +5,15 @@ Handles RAG chain creation and query processing with multilingual support
 
 from langchain_huggingface import HuggingFaceEndpoint, ChatHuggingFace
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableParallel, RunnablePassthrough, RunnableLambda
+from langchain_core.runnables import RunnableParallel, RunnableLambda
 from langchain_core.output_parsers import StrOutputParser
+from operator import itemgetter
 from dotenv import load_dotenv
+from typing import Callable, Optional
+import numpy as np
+import faiss
+import asyncio
+import functools
 import os
 
 # Try to import streamlit for secrets management
@@ -19,15 +25,91 @@ except ImportError:
 
 load_dotenv()
 
+@functools.lru_cache(maxsize=1)
 def get_api_token():
-    """Get API token from Streamlit secrets or environment variable"""
+    """Get API token from Streamlit secrets or environment variable (read once per process)"""
     if HAS_STREAMLIT:
         try:
             return st.secrets.get("HUGGINGFACEHUB_API_TOKEN")
-        except:
+        except Exception:
             pass
     return os.getenv("HUGGINGFACEHUB_API_TOKEN")
 
+
+def _cache_resource(func):
+    """Cache across Streamlit reruns, or per process when Streamlit is unavailable"""
+    if HAS_STREAMLIT:
+        return st.cache_resource(show_spinner=False)(func)
+    return functools.lru_cache(maxsize=None)(func)
+
+
+@_cache_resource
+def get_llm_client(
+    repo_id: str,
+    max_new_tokens: int,
+    temperature: float,
+    token: str
+) -> ChatHuggingFace:
+    """
+    Build the chat model once per parameter set and reuse it across reruns
+    
+    Args:
+        repo_id: HuggingFace model repository ID
+        max_new_tokens: Maximum tokens to generate
+        temperature: Sampling temperature
+        token: HuggingFace API token
+        
+    Returns:
+        ChatHuggingFace client
+    """
+    llm = HuggingFaceEndpoint(
+        repo_id=repo_id,
+        task="text-generation",
+        max_new_tokens=max_new_tokens,
+        temperature=temperature,
+        top_k=50,
+        repetition_penalty=1.03,
+        huggingfacehub_api_token=token
+    )
+    return ChatHuggingFace(llm=llm)
+
+
+def _format_docs(retrieved_docs) -> str:
+    """Join retrieved chunks into a single context string"""
+    # str.join sizes the result in one pass over a list; a generator would
+    # first be copied into a temporary list
+    return "\n\n".join([doc.page_content for doc in retrieved_docs])
+
+
+# Prompt template - ENGLISH ONLY
+_SYSTEM_MSG = """You are a helpful AI assistant that answers questions based on YouTube video transcripts.
+
+    IMPORTANT INSTRUCTIONS:
+    - Answer ONLY using information from the provided context
+    - The context may be in Hindi, English, or any other language
+    - **ALWAYS respond in ENGLISH, regardless of the question language or context language**
+    - If the context is in Hindi or another language, translate the information to English in your response
+    - If the context doesn't contain enough information, say: "I don't have enough information in the transcript to answer that"
+    - Be concise, clear, and specific
+    - Use direct quotes when relevant (translate them to English if needed)
+    - Maintain a conversational but informative tone
+    - Never respond in Hindi or any language other than English"""
+
+_USER_MSG = """Context from video transcript (may be in any language):
+    {context}
+
+    Question: {question}
+
+    Remember: Your response MUST be in ENGLISH only.
+
+    Answer:"""
+
+_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", _SYSTEM_MSG),
+    ("user", _USER_MSG)
+])
+
+
 class QueryEngine:
     """Handles query processing using RAG with multilingual support"""
     
@@ -43,6 +125,7 @@ class QueryEngine:
         self.k = k
         self.model = None
         self.rag_chain = None
+        self.answer_chain = None
         self.retriever = None
         
         self._initialize_llm()
@@ -51,17 +134,12 @@ class QueryEngine:
     def _initialize_llm(self):
         """Initialize the language model"""
         try:
-            llm = HuggingFaceEndpoint(
+            self.model = get_llm_client(
                 repo_id="meta-llama/Llama-3.1-8B-Instruct",
-                task="text-generation",
                 max_new_tokens=512,
                 temperature=0.2,
-                top_k=50,
-                repetition_penalty=1.03,
-                huggingfacehub_api_token=get_api_token()
+                token=get_api_token()
             )
-            
-            self.model = ChatHuggingFace(llm=llm)
             print("✓ LLM initialized (supports multilingual responses)")
             
         except Exception as e:
@@ -77,42 +155,21 @@ class QueryEngine:
                 search_kwargs={"k": self.k}
             )
             
-            # Create prompt template - ENGLISH ONLY
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are a helpful AI assistant that answers questions based on YouTube video transcripts.
-
-    IMPORTANT INSTRUCTIONS:
-    - Answer ONLY using information from the provided context
-    - The context may be in Hindi, English, or any other language
-    - **ALWAYS respond in ENGLISH, regardless of the question language or context language**
-    - If the context is in Hindi or another language, translate the information to English in your response
-    - If the context doesn't contain enough information, say: "I don't have enough information in the transcript to answer that"
-    - Be concise, clear, and specific
-    - Use direct quotes when relevant (translate them to English if needed)
-    - Maintain a conversational but informative tone
-    - Never respond in Hindi or any language other than English"""),
-                ("user", """Context from video transcript (may be in any language):
-    {context}
-
-    Question: {question}
-
-    Remember: Your response MUST be in ENGLISH only.
-
-    Answer:""")
-            ])
+            # Retrieve once in a single step; docs are kept for sources
+            def retrieve(question):
+                docs = self.retriever.invoke(question)
+                return {'context': _format_docs(docs), 'question': question, 'docs': docs}
             
-            # Helper function to format documents
-            def format_docs(retrieved_docs):
-                return "\n\n".join(doc.page_content for doc in retrieved_docs)
+            parallel_chain = RunnableLambda(retrieve)
             
-            # Build parallel chain
-            parallel_chain = RunnableParallel({
-                'context': self.retriever | RunnableLambda(format_docs),
-                'question': RunnablePassthrough()
-            })
+            # Answer chain takes a ready {'context', 'question'} dict (used for batching)
+            self.answer_chain = _PROMPT | self.model | StrOutputParser()
             
-            # Complete RAG chain
-            self.rag_chain = parallel_chain | prompt | self.model | StrOutputParser()
+            # Complete RAG chain, emitting {'answer', 'docs'}
+            self.rag_chain = parallel_chain | RunnableParallel({
+                'answer': self.answer_chain,
+                'docs': itemgetter('docs')
+            })
             
             print("✓ RAG chain built (English-only responses)")
             
@@ -132,17 +189,14 @@ class QueryEngine:
             Dictionary with answer and sources
         """
         try:
-            # Get answer
-            answer = self.rag_chain.invoke(question)
-            
-            # Get source documents
-            source_docs = self.retriever.invoke(question)
-            sources = [doc.page_content for doc in source_docs]
+            # Get answer and the documents it was grounded on
+            output = self.rag_chain.invoke(question)
+            sources = [doc.page_content for doc in output['docs']]
             
             return {
                 'success': True,
                 'question': question,
-                'answer': answer,
+                'answer': output['answer'],
                 'sources': sources,
                 'num_sources': len(sources),
                 'error': None
@@ -158,6 +212,27 @@ class QueryEngine:
                 'error': f"Error processing query: {str(e)}"
             }
     
+    def stream_query(
+        self,
+        question: str,
+        on_sources: Optional[Callable[[list], None]] = None
+    ):
+        """
+        Stream the answer to a question as it is generated
+        
+        Args:
+            question: User's question in Hindi or English
+            on_sources: Optional callback receiving the source chunk texts
+            
+        Yields:
+            Answer text chunks in arrival order
+        """
+        for chunk in self.rag_chain.stream(question):
+            if 'docs' in chunk and on_sources is not None:
+                on_sources([doc.page_content for doc in chunk['docs']])
+            if 'answer' in chunk:
+                yield chunk['answer']
+    
     def similarity_search(self, query: str, k: int = 5) -> list:
         """
         Search for similar content with scores
@@ -186,6 +261,44 @@ class QueryEngine:
         self.k = new_k
         self.retriever.search_kwargs["k"] = new_k
     
+    def update_ef_search(self, ef_search: int):
+        """
+        Update the HNSW search depth (higher = better recall, slower search)
+        
+        Args:
+            ef_search: New efSearch value
+        """
+        index = self.vector_store.index
+        if hasattr(index, "hnsw"):
+            index.hnsw.efSearch = ef_search
+    
+    def _batch_retrieve(self, questions: list) -> list:
+        """
+        Retrieve documents for several questions with one embedding call
+        and one FAISS search
+        
+        Args:
+            questions: List of questions
+            
+        Returns:
+            List of retrieved document lists, one per question
+        """
+        vectors = np.asarray(
+            self.vector_store.embedding_function.embed_documents(questions),
+            dtype=np.float32
+        )
+        if getattr(self.vector_store, "_normalize_L2", False):
+            faiss.normalize_L2(vectors)
+        
+        _, indices = self.vector_store.index.search(vectors, self.k)
+        
+        index_to_id = self.vector_store.index_to_docstore_id
+        docstore = self.vector_store.docstore
+        return [
+            [docstore.search(index_to_id[i]) for i in row if i != -1]
+            for row in indices
+        ]
+    
     def batch_query(self, questions: list) -> list:
         """
         Process multiple questions (Hindi or English)
@@ -196,11 +309,82 @@ class QueryEngine:
         Returns:
             List of result dictionaries
         """
+        try:
+            docs_per_question = self._batch_retrieve(questions)
+            answers = self.answer_chain.batch([
+                {'context': _format_docs(docs), 'question': question}
+                for docs, question in zip(docs_per_question, questions)
+            ])
+        except Exception as e:
+            print(f"Batch query failed, falling back to sequential queries: {e}")
+            return [self.query(question) for question in questions]
+        
+        results = []
+        for question, answer, docs in zip(questions, answers, docs_per_question):
+            sources = [doc.page_content for doc in docs]
+            results.append({
+                'success': True,
+                'question': question,
+                'answer': answer,
+                'sources': sources,
+                'num_sources': len(sources),
+                'error': None
+            })
+        return results
+    
+    async def abatch_query(self, questions: list, max_concurrency: int = 8) -> list:
+        """
+        Process multiple questions with overlapping LLM requests
+        
+        Args:
+            questions: List of questions
+            max_concurrency: Maximum number of in-flight LLM requests
+            
+        Returns:
+            List of result dictionaries
+        """
+        outputs = await self.rag_chain.abatch(
+            questions,
+            config={'max_concurrency': max_concurrency},
+            return_exceptions=True
+        )
+        
         results = []
-        for question in questions:
-            result = self.query(question)
-            results.append(result)
+        for question, output in zip(questions, outputs):
+            if isinstance(output, Exception):
+                results.append({
+                    'success': False,
+                    'question': question,
+                    'answer': None,
+                    'sources': [],
+                    'num_sources': 0,
+                    'error': f"Error processing query: {str(output)}"
+                })
+                continue
+            
+            sources = [doc.page_content for doc in output['docs']]
+            results.append({
+                'success': True,
+                'question': question,
+                'answer': output['answer'],
+                'sources': sources,
+                'num_sources': len(sources),
+                'error': None
+            })
         return results
+    
+    def concurrent_batch_query(self, questions: list, max_concurrency: int = 8) -> list:
+        """
+        Synchronous wrapper around abatch_query
+        
+        Args:
+            questions: List of questions
+            max_concurrency: Maximum number of in-flight LLM requests
+            
+        Returns:
+            List of result dictionaries
+        """
+        return asyncio.run(self.abatch_query(questions, max_concurrency))
 
 
 # Testing function
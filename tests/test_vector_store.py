@@ -0,0 +1,68 @@
+"""
+Tests for transcript chunking and video ID extraction
+"""
+
+import pytest
+
+from vector_store import VectorStoreManager, fast_split
+
+
+def test_fast_split_chunks_fit_and_overlap():
+    text = " ".join(f"word{i}" for i in range(500))
+    chunks = fast_split(text, chunk_size=100, chunk_overlap=20)
+
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert chunks[0].startswith("word0 ")
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.split()[0] in previous.split()
+
+
+def test_fast_split_last_chunk_ends_at_last_word():
+    assert fast_split("one two three", chunk_size=9, chunk_overlap=4) == ["one two", "two three"]
+
+
+def test_fast_split_text_without_whitespace():
+    assert fast_split("a" * 2500, chunk_size=1000, chunk_overlap=200) == ["a" * 1000, "a" * 1000, "a" * 500]
+
+
+def test_fast_split_word_longer_than_chunk_size():
+    text = "short " + "x" * 250 + " tail"
+    assert fast_split(text, chunk_size=100, chunk_overlap=10) == [
+        "short", "x" * 100, "x" * 100, "x" * 50, "tail"
+    ]
+
+
+def test_fast_split_blank_text():
+    assert fast_split(" \n\t ", chunk_size=100, chunk_overlap=10) == []
+
+
+@pytest.mark.parametrize("chunk_overlap", [100, 150])
+def test_fast_split_rejects_overlap_not_smaller_than_chunk_size(chunk_overlap):
+    with pytest.raises(ValueError):
+        fast_split("some text", chunk_size=100, chunk_overlap=chunk_overlap)
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://m.youtube.com/watch?v=dQw4w9WgXcQ&t=42s",
+    "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+    "https://youtu.be/dQw4w9WgXcQ",
+    "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+    "https://www.youtube.com/embed/dQw4w9WgXcQ",
+    "https://www.youtube.com/v/dQw4w9WgXcQ",
+    "https://www.YouTube.com/watch?v=dQw4w9WgXcQ",
+    "HTTPS://YOUTU.BE/dQw4w9WgXcQ",
+    "dQw4w9WgXcQ",
+])
+def test_extract_video_id(url):
+    assert VectorStoreManager.extract_video_id(url) == "dQw4w9WgXcQ"
+
+
+@pytest.mark.parametrize("url", [
+    "",
+    "not a video",
+    "https://example.com/watch?v=dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?v=short",
+])
+def test_extract_video_id_rejects_other_input(url):
+    assert VectorStoreManager.extract_video_id(url) is None
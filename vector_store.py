@@ -7,10 +7,29 @@ from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled
 from youtube_transcript_api._errors import NoTranscriptFound
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain_huggingface import HuggingFaceEndpointEmbeddings
-from urllib.parse import parse_qs, urlparse
+from langchain_core.documents import Document
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Callable, Optional
+import numpy as np
+import faiss
+import asyncio
+import functools
+import glob
+import hashlib
+import json
 import os
+import re
+import requests
+import sqlite3
+import threading
+import time
 
 # Try to import streamlit for secrets management
 try:
@@ -21,37 +40,329 @@ except ImportError:
 
 load_dotenv()
 
+# Match FAISS's OpenMP threads to the CPUs this process may actually use
+# (os.cpu_count() ignores affinity masks and container CPU limits)
+if hasattr(os, "sched_getaffinity"):
+    faiss.omp_set_num_threads(len(os.sched_getaffinity(0)))
 
+EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+
+# Embedding backend: "hf_api" (HF Inference API), "tei" (Text-Embeddings-Inference
+# server at TEI_URL) or "local_st" (in-process sentence-transformers)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "hf_api")
+TEI_URL = os.getenv("TEI_URL", "http://localhost:8080")
+
+# Longest transcript (in characters) that is indexed, to bound memory use
+MAX_TRANSCRIPT_LENGTH = 2_000_000
+
+# On-disk cache for chunk embeddings and per-video indexes
+CACHE_DIR = "cache"
+
+# Seconds without embedding requests after which a hosted endpoint is treated as cold
+WARMUP_IDLE_SECONDS = 300
+
+# Matches youtu.be/, watch?v=, /shorts/, /embed/ and /v/ URL forms in one pass;
+# hosts and paths are case-insensitive (the ID class already covers both cases)
+_YT_ID_RE = re.compile(
+    r'(?:youtu\.be/|youtube\.com/(?:watch\?(?:.*&)?v=|shorts/|embed/|v/))([A-Za-z0-9_-]{11})',
+    re.IGNORECASE
+)
+
+# A bare video ID
+_BARE_ID_RE = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+# Words (runs of non-whitespace) are the split boundaries for fast_split
+_WORD_RE = re.compile(r'\S+')
+
+
+@functools.lru_cache(maxsize=1)
 def get_api_token():
-    """Get API token from Streamlit secrets or environment variable"""
+    """Get API token from Streamlit secrets or environment variable (read once per process)"""
     if HAS_STREAMLIT:
         try:
             return st.secrets.get("HUGGINGFACEHUB_API_TOKEN")
-        except:
+        except Exception:
             pass
     return os.getenv("HUGGINGFACEHUB_API_TOKEN")
 
 
+def _join_snippets(fetched_transcript) -> str:
+    """Join transcript snippets into one string"""
+    # List comprehension, not a generator: join would materialize one anyway
+    return " ".join([snippet.text for snippet in fetched_transcript])
+
+
+def fast_split(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> list:
+    """
+    Split text into overlapping chunks on word boundaries in a single pass
+    
+    Args:
+        text: Text to split
+        chunk_size: Maximum chunk length in characters
+        chunk_overlap: Maximum overlap between consecutive chunks in characters
+        
+    Returns:
+        List of chunk strings
+    """
+    if chunk_overlap >= chunk_size:
+        raise ValueError(
+            f"chunk_overlap ({chunk_overlap}) must be smaller than chunk_size ({chunk_size})"
+        )
+    
+    spans = np.array([m.span() for m in _WORD_RE.finditer(text)], dtype=np.int64).reshape(-1, 2)
+    starts, ends = spans[:, 0], spans[:, 1]
+    num_words = len(starts)
+    
+    chunks = []
+    i = 0
+    while i < num_words:
+        # Last word that still fits in a chunk starting at word i
+        j = int(np.searchsorted(ends, starts[i] + chunk_size, side='right')) - 1
+        
+        if j < i:
+            # A single word longer than chunk_size is cut into fixed-size pieces
+            word = text[starts[i]:ends[i]]
+            chunks.extend(word[p:p + chunk_size] for p in range(0, len(word), chunk_size))
+            i += 1
+            continue
+        
+        chunks.append(text[starts[i]:ends[j]])
+        if j == num_words - 1:
+            break
+        
+        # Next chunk starts at the first word within chunk_overlap of this chunk's end
+        next_i = int(np.searchsorted(starts, ends[j] - chunk_overlap, side='left'))
+        i = max(next_i, i + 1)
+    
+    return chunks
+
+
+# Scalar quantizer per storage precision (None = plain float32)
+_SQ_TYPES = {
+    "fp32": None,
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit
+}
+
+
+def _build_index(
+    vectors: np.ndarray,
+    index_type: str = "hnsw",
+    precision: str = "int8",
+    m: int = 32,
+    ef_construction: int = 200,
+    ef_search: int = 64
+) -> faiss.Index:
+    """
+    Build a FAISS index over normalized vectors, searched by inner product
+    
+    Args:
+        vectors: Float32 embedding matrix of shape (num_chunks, dim), normalized in place
+        index_type: "hnsw" (graph), "ivfpq" (inverted lists + product quantization)
+            or "flat" (exhaustive scan)
+        precision: Stored vector precision for hnsw/flat ("fp32", "fp16" or "int8");
+            ivfpq always stores PQ codes
+        m: Number of graph neighbours per node (hnsw)
+        ef_construction: Candidate list size while building the graph (hnsw)
+        ef_search: Candidate list size while searching (hnsw)
+        
+    Returns:
+        Trained and populated FAISS index
+    """
+    if precision not in _SQ_TYPES:
+        raise ValueError(f"Unknown precision: {precision}")
+    sq_type = _SQ_TYPES[precision]
+    
+    # Unit-length vectors make inner product equal cosine similarity and keep
+    # every component in [-1, 1], so scalar quantization loses almost nothing
+    faiss.normalize_L2(vectors)
+    num_vectors, dim = vectors.shape
+    
+    # PQ training needs at least 2^nbits points and subvectors that divide dim
+    pq_m, pq_nbits = 32, 8
+    if index_type == "ivfpq" and (num_vectors < 2 ** pq_nbits or dim % pq_m):
+        print(f"Too few chunks ({num_vectors}) for IVF-PQ, using HNSW instead")
+        index_type = "hnsw"
+    
+    if index_type == "hnsw":
+        # HNSW graph for sub-linear search; fp16/int8 store 2/1 bytes per dimension instead of 4
+        if sq_type is None:
+            index = faiss.IndexHNSWFlat(dim, m, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexHNSWSQ(dim, sq_type, m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = ef_construction
+        index.hnsw.efSearch = ef_search
+    elif index_type == "ivfpq":
+        # Search only the closest sqrt(N) clusters; pq_m bytes per vector
+        nlist = max(4, int(np.sqrt(num_vectors)))
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, pq_m, pq_nbits, faiss.METRIC_INNER_PRODUCT)
+        index.nprobe = min(nlist, 8)
+    elif index_type == "flat":
+        if sq_type is None:
+            index = faiss.IndexFlatIP(dim)
+        else:
+            index = faiss.IndexScalarQuantizer(dim, sq_type, faiss.METRIC_INNER_PRODUCT)
+    else:
+        raise ValueError(f"Unknown index type: {index_type}")
+    
+    index.train(vectors)
+    index.add(vectors)
+    return index
+
+
+class SqliteEmbeddingCache:
+    """Persistent embedding cache keyed by the SHA-256 of the chunk text"""
+    
+    # Stay below SQLite's limit on host parameters per statement
+    _MAX_PARAMS = 500
+    
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache database
+        
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (sha256 BLOB PRIMARY KEY, dim INTEGER, vec BLOB)"
+            )
+    
+    def get_many(self, hashes: list, dim: Optional[int] = None) -> dict:
+        """
+        Look up cached vectors
+        
+        Args:
+            hashes: SHA-256 digests of chunk texts
+            dim: Expected vector dimension; entries of any other size are misses
+            
+        Returns:
+            Dictionary mapping digest to float32 vector for every hit
+        """
+        found = {}
+        unique_hashes = list(set(hashes))
+        with closing(sqlite3.connect(self.path)) as conn:
+            for i in range(0, len(unique_hashes), self._MAX_PARAMS):
+                batch = unique_hashes[i:i + self._MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT sha256, dim, vec FROM cache WHERE sha256 IN ({placeholders})",
+                    batch
+                )
+                for digest, vec_dim, vec in rows:
+                    vector = np.frombuffer(vec, dtype=np.float32)
+                    # Skip truncated rows and vectors from a different model
+                    if len(vector) != vec_dim or (dim is not None and vec_dim != dim):
+                        continue
+                    found[digest] = vector
+        return found
+    
+    def put_many(self, items: list):
+        """
+        Store vectors, replacing any existing entry for the same digest
+        
+        Args:
+            items: List of (digest, vector) pairs
+        """
+        rows = [
+            (digest, len(vector), np.asarray(vector, dtype=np.float32).tobytes())
+            for digest, vector in items
+        ]
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)", rows)
+
+
 class VectorStoreManager:
     """Manages vector store creation and transcript processing"""
     
+    # Shared transcript client, reusing pooled HTTP connections across videos
+    _api = None
+    
     def __init__(self):
         """Initialize the vector store manager"""
-        self.embedding_model = None
-        self._initialize_embeddings()
+        self._embedding_model = None
+        # Learned from the first embedding call; rejects cached vectors of another size
+        self._embedding_dim = None
+        # time.monotonic() of the last embedding request or warm-up, to warm only cold endpoints
+        self._last_embed_time = None
+        # Guards lazy init and warm-up start against the warm-up thread and concurrent videos
+        self._init_lock = threading.Lock()
+        # One database per backend and model, so switching models never reuses vectors
+        model_id = TEI_URL if EMBEDDING_BACKEND == "tei" else EMBEDDING_MODEL
+        model_slug = re.sub(r'[^A-Za-z0-9.-]+', '_', model_id)
+        self.embedding_cache = SqliteEmbeddingCache(
+            os.path.join(CACHE_DIR, f"embeddings_{EMBEDDING_BACKEND}_{model_slug}.sqlite")
+        )
+    
+    @property
+    def embedding_model(self):
+        """Embedding model, created on first use so failed lookups never pay for it"""
+        if self._embedding_model is None:
+            with self._init_lock:
+                if self._embedding_model is None:
+                    self._initialize_embeddings()
+        return self._embedding_model
     
     def _initialize_embeddings(self):
         """Initialize the multilingual embedding model"""
         try:
-            self.embedding_model = HuggingFaceEndpointEmbeddings(
-                model="sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
-                huggingfacehub_api_token=get_api_token()  # Changed this line
-            )
-            print("✓ Multilingual embedding model initialized (supports Hindi + English)")
+            if EMBEDDING_BACKEND == "hf_api":
+                self._embedding_model = HuggingFaceEndpointEmbeddings(
+                    model=EMBEDDING_MODEL,
+                    huggingfacehub_api_token=get_api_token()  # Changed this line
+                )
+            elif EMBEDDING_BACKEND == "tei":
+                self._embedding_model = HuggingFaceEndpointEmbeddings(model=TEI_URL)
+            elif EMBEDDING_BACKEND == "local_st":
+                # Optional dependencies, only needed for the local backend
+                from langchain_huggingface import HuggingFaceEmbeddings
+                import torch
+                
+                self._embedding_model = HuggingFaceEmbeddings(
+                    model_name=EMBEDDING_MODEL,
+                    model_kwargs={"device": "cuda" if torch.cuda.is_available() else "cpu"},
+                    encode_kwargs={"batch_size": 64, "normalize_embeddings": True}
+                )
+            else:
+                raise ValueError(f"Unknown EMBEDDING_BACKEND: {EMBEDDING_BACKEND}")
+            print(f"✓ Multilingual embedding model initialized via {EMBEDDING_BACKEND} (supports Hindi + English)")
         except Exception as e:
             print(f"✗ Error initializing embeddings: {e}")
             raise
     
+    def _warm_up_embeddings(self, video_id: str):
+        """
+        Send one throwaway embedding request in the background so the
+        endpoint's cold start overlaps with fetching the transcript
+        
+        Skipped when the endpoint was used recently or when the video was
+        indexed before under other settings, since its chunks are then
+        already in the embedding cache
+        
+        Args:
+            video_id: YouTube video ID about to be processed
+        """
+        if EMBEDDING_BACKEND == "local_st":
+            return
+        if glob.glob(os.path.join(CACHE_DIR, f"index_{EMBEDDING_BACKEND}_ip_*", video_id)):
+            return
+        with self._init_lock:
+            now = time.monotonic()
+            if self._last_embed_time is not None and now - self._last_embed_time < WARMUP_IDLE_SECONDS:
+                return
+            self._last_embed_time = now
+        
+        def warm_up():
+            try:
+                self.embedding_model.embed_query("warmup")
+            except Exception as e:
+                print(f"Embedding warm-up failed: {e}")
+        
+        threading.Thread(target=warm_up, daemon=True).start()
+    
     @staticmethod
     def extract_video_id(url: str) -> str:
         """
@@ -64,24 +375,12 @@ class VectorStoreManager:
             Video ID string or None
         """
         try:
-            parsed = urlparse(url)
-            
-            # Handle youtu.be links
-            if parsed.netloc.lower() == 'youtu.be':
-                return parsed.path.split('/')[-1]
-            
-            # Handle youtube.com/shorts links
-            if parsed.path.lower().startswith('/shorts'):
-                return parsed.path.split('/')[-1]
-            
-            # Handle youtube.com/watch links
-            if parsed.query:
-                video_id = parse_qs(parsed.query).get('v')
-                if video_id:
-                    return video_id[0]
+            match = _YT_ID_RE.search(url)
+            if match:
+                return match.group(1)
             
             # If just video ID is provided
-            if len(url) == 11 and '/' not in url:
+            if _BARE_ID_RE.match(url):
                 return url
                 
             return None
@@ -89,8 +388,24 @@ class VectorStoreManager:
             print(f"Error extracting video ID: {e}")
             return None
     
-    @staticmethod
-    def fetch_transcript(video_id: str) -> tuple:
+    @classmethod
+    def _get_api(cls) -> YouTubeTranscriptApi:
+        """Create the shared transcript API client on first use"""
+        if cls._api is None:
+            retry = Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            cls._api = YouTubeTranscriptApi(http_client=session)
+        return cls._api
+    
+    @classmethod
+    def fetch_transcript(cls, video_id: str) -> tuple:
         """
         Fetch transcript for a YouTube video in Hindi or English
         
@@ -101,7 +416,7 @@ class VectorStoreManager:
             Tuple of (transcript_text, language, is_generated, error_message)
         """
         try:
-            ytt_api = YouTubeTranscriptApi()
+            ytt_api = cls._get_api()
             
             # Try to fetch transcript in Hindi or English (priority order)
             # Supports: Hindi (hi), English (en), and auto-generated versions
@@ -111,7 +426,7 @@ class VectorStoreManager:
             )
             
             # Extract text from transcript
-            transcript = " ".join(snippet.text for snippet in fetched_transcript)
+            transcript = _join_snippets(fetched_transcript)
             
             return (
                 transcript,
@@ -127,18 +442,15 @@ class VectorStoreManager:
             try:
                 transcript_list = ytt_api.list(video_id)
                 
-                # Get the first available transcript
-                available_transcripts = transcript_list.transcripts
-                if available_transcripts:
-                    # Get first available transcript
-                    first_transcript = list(available_transcripts.values())[0]
-                    
+                # Get the first available transcript (manual ones come first)
+                first_transcript = next(iter(transcript_list), None)
+                if first_transcript is not None:
                     # If it's translatable, translate to English
                     if first_transcript.is_translatable:
                         print(f"Translating from {first_transcript.language_code} to English...")
                         translated = first_transcript.translate('en')
                         fetched_transcript = translated.fetch()
-                        transcript = " ".join(snippet.text for snippet in fetched_transcript)
+                        transcript = _join_snippets(fetched_transcript)
                         
                         return (
                             transcript,
@@ -155,11 +467,152 @@ class VectorStoreManager:
         except Exception as e:
             return None, None, None, f"Error: {str(e)}"
     
+    def _embed_texts(self, texts: list, batch_size: int = 32, max_workers: int = 8) -> np.ndarray:
+        """
+        Embed texts in batches, sending batches to the endpoint concurrently
+        
+        Args:
+            texts: Texts to embed
+            batch_size: Number of texts per embedding request
+            max_workers: Maximum number of concurrent requests (network backends only)
+            
+        Returns:
+            Float32 embedding matrix of shape (len(texts), dim)
+        """
+        if EMBEDDING_BACKEND == "local_st":
+            # Compute-bound and already batched by encode_kwargs; threads would
+            # only contend for the same model
+            return np.asarray(self.embedding_model.embed_documents(texts), dtype=np.float32)
+        
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        
+        # Requests are I/O-bound, so threads overlap the round-trips
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            batch_vectors = list(executor.map(self.embedding_model.embed_documents, batches))
+        self._last_embed_time = time.monotonic()
+        
+        vectors = [vector for batch in batch_vectors for vector in batch]
+        return np.asarray(vectors, dtype=np.float32)
+    
+    def _embed_with_cache(self, texts: list, batch_size: int = 32, max_workers: int = 8) -> np.ndarray:
+        """
+        Embed texts, reusing vectors cached on disk and embedding each
+        distinct missing text once
+        
+        Args:
+            texts: Texts to embed
+            batch_size: Number of texts per embedding request
+            max_workers: Maximum number of concurrent requests
+            
+        Returns:
+            Float32 embedding matrix of shape (len(texts), dim)
+        """
+        hashes = [hashlib.sha256(text.encode("utf-8")).digest() for text in texts]
+        vectors_by_hash = self.embedding_cache.get_many(hashes, self._embedding_dim)
+        
+        # Overlapping chunks often repeat (intros, outros, catchphrases)
+        text_by_hash = dict(zip(hashes, texts))
+        missing = [digest for digest in text_by_hash if digest not in vectors_by_hash]
+        if missing:
+            new_vectors = self._embed_texts(
+                [text_by_hash[digest] for digest in missing],
+                batch_size,
+                max_workers
+            )
+            self._embedding_dim = new_vectors.shape[1]
+            new_items = list(zip(missing, new_vectors))
+            self.embedding_cache.put_many(new_items)
+            vectors_by_hash.update(new_items)
+        
+        # One contiguous float32 matrix so FAISS can add it without copying
+        return np.ascontiguousarray(
+            np.vstack([vectors_by_hash[digest] for digest in hashes]),
+            dtype=np.float32
+        )
+    
+    def _video_cache_dir(self, video_id: str, index_type: str, precision: str) -> str:
+        """
+        Directory holding the saved index and metadata for a video
+        
+        The name encodes backend, metric, index type and precision so indexes
+        built with different settings (e.g. older L2 caches) are never reused
+        """
+        return os.path.join(
+            CACHE_DIR,
+            f"index_{EMBEDDING_BACKEND}_ip_{index_type}_{precision}",
+            video_id
+        )
+    
+    def _load_cached_video(self, video_id: str, index_type: str, precision: str):
+        """
+        Load a previously built vector store for a video
+        
+        Args:
+            video_id: YouTube video ID
+            index_type: FAISS index type the store was built with
+            precision: Stored vector precision the store was built with
+            
+        Returns:
+            Tuple of (vector_store, metadata), or None if not cached
+        """
+        cache_dir = self._video_cache_dir(video_id, index_type, precision)
+        metadata_path = os.path.join(cache_dir, "metadata.json")
+        if not os.path.exists(metadata_path):
+            return None
+        
+        try:
+            # Only files written by _save_cached_video are loaded here
+            vector_store = FAISS.load_local(
+                cache_dir,
+                self.embedding_model,
+                allow_dangerous_deserialization=True,
+                # Not pickled by save_local; must match create_vector_store
+                normalize_L2=True,
+                distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+            )
+            with open(metadata_path, encoding="utf-8") as f:
+                metadata = json.load(f)
+            return vector_store, metadata
+        except Exception as e:
+            print(f"Error loading cached index for {video_id}: {e}")
+            return None
+    
+    def _save_cached_video(
+        self,
+        video_id: str,
+        vector_store,
+        metadata: dict,
+        index_type: str,
+        precision: str
+    ):
+        """
+        Save a vector store and its metadata for reuse on later visits
+        
+        Args:
+            video_id: YouTube video ID
+            vector_store: FAISS vector store
+            metadata: Processing metadata
+            index_type: FAISS index type the store was built with
+            precision: Stored vector precision the store was built with
+        """
+        cache_dir = self._video_cache_dir(video_id, index_type, precision)
+        try:
+            vector_store.save_local(cache_dir)
+            with open(os.path.join(cache_dir, "metadata.json"), "w", encoding="utf-8") as f:
+                json.dump(metadata, f)
+        except Exception as e:
+            print(f"Error caching index for {video_id}: {e}")
+    
     def create_vector_store(
         self,
         transcript: str,
         chunk_size: int = 1000,
-        chunk_overlap: int = 200
+        chunk_overlap: int = 200,
+        batch_size: int = 32,
+        max_workers: int = 8,
+        index_type: str = "hnsw",
+        precision: str = "int8",
+        separators: Optional[list] = None
     ) -> tuple:
         """
         Create FAISS vector store from transcript
@@ -168,39 +621,82 @@ class VectorStoreManager:
             transcript: Video transcript text (Hindi or English)
             chunk_size: Size of text chunks
             chunk_overlap: Overlap between chunks
+            batch_size: Number of chunks per embedding request
+            max_workers: Maximum number of concurrent embedding requests
+            index_type: FAISS index type ("hnsw", "ivfpq" or "flat")
+            precision: Stored vector precision ("fp32", "fp16" or "int8")
+            separators: Custom separators; uses LangChain's recursive splitter when given
             
         Returns:
             Tuple of (vector_store, num_chunks, error_message)
         """
         try:
-            # Split transcript into chunks
-            splitter = RecursiveCharacterTextSplitter(
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                length_function=len,
-                separators=["\n\n", "\n", " ", ""]
-            )
+            # Reject empty or oversized transcripts before any work
+            if not transcript or not transcript.strip():
+                return None, 0, "Transcript is empty"
+            if len(transcript) > MAX_TRANSCRIPT_LENGTH:
+                return None, 0, (
+                    f"Transcript is too long ({len(transcript):,} characters, "
+                    f"max {MAX_TRANSCRIPT_LENGTH:,})"
+                )
             
-            chunks = splitter.create_documents([transcript])
+            # Split transcript into chunks (short ones fit in a single chunk)
+            if len(transcript) <= chunk_size:
+                texts = [transcript.strip()]
+            elif separators is None:
+                texts = fast_split(transcript, chunk_size, chunk_overlap)
+            else:
+                splitter = RecursiveCharacterTextSplitter(
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                    length_function=len,
+                    separators=separators
+                )
+                texts = splitter.split_text(transcript)
             
-            # Create vector store with multilingual embeddings
-            vector_store = FAISS.from_documents(chunks, self.embedding_model)
+            chunks = [Document(page_content=text) for text in texts]
+            
+            # Embed chunks with multilingual embeddings
+            vectors = self._embed_with_cache(texts, batch_size, max_workers)
+            
+            # Create vector store over a compressed approximate index
+            vector_store = FAISS(
+                embedding_function=self.embedding_model,
+                index=_build_index(vectors, index_type, precision),
+                docstore=InMemoryDocstore({str(i): chunk for i, chunk in enumerate(chunks)}),
+                index_to_docstore_id={i: str(i) for i in range(len(chunks))},
+                normalize_L2=True,
+                distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+            )
             
             return vector_store, len(chunks), None
             
         except Exception as e:
             return None, 0, f"Error creating vector store: {str(e)}"
     
-    def process_video(self, video_url: str) -> dict:
+    def process_video(
+        self,
+        video_url: str,
+        progress_cb: Optional[Callable[[str, int], None]] = None,
+        index_type: str = "hnsw",
+        precision: str = "int8"
+    ) -> dict:
         """
         Complete video processing pipeline for Hindi/English videos
         
         Args:
             video_url: YouTube video URL or ID
+            progress_cb: Optional callback receiving (status message, percent complete)
+            index_type: FAISS index type ("hnsw", "ivfpq" or "flat")
+            precision: Stored vector precision ("fp32", "fp16" or "int8")
             
         Returns:
             Dictionary with processing results
         """
+        def report(message, percent):
+            if progress_cb is not None:
+                progress_cb(message, percent)
+        
         result = {
             'success': False,
             'video_id': None,
@@ -217,17 +713,37 @@ class VectorStoreManager:
         
         result['video_id'] = video_id
         
+        # Reuse the index if this video was processed before
+        cached = self._load_cached_video(video_id, index_type, precision)
+        if cached:
+            vector_store, metadata = cached
+            report(f"✓ Loaded cached knowledge base ({metadata['num_chunks']} chunks)", 75)
+            result['success'] = True
+            result['vector_store'] = vector_store
+            result['metadata'] = metadata
+            return result
+        
+        # Prime a cold embedding endpoint while the transcript downloads
+        self._warm_up_embeddings(video_id)
+        
         # Fetch transcript (Hindi or English)
+        report("📥 Fetching transcript...", 10)
         transcript, language, is_generated, error = self.fetch_transcript(video_id)
         if error:
             result['error'] = error
             return result
         
         # Create vector store
-        vector_store, num_chunks, error = self.create_vector_store(transcript)
+        report("🧠 Creating knowledge base...", 40)
+        vector_store, num_chunks, error = self.create_vector_store(
+            transcript,
+            index_type=index_type,
+            precision=precision
+        )
         if error:
             result['error'] = error
             return result
+        report(f"✓ Knowledge base ready ({num_chunks} chunks)", 75)
         
         # Success
         result['success'] = True
@@ -239,8 +755,45 @@ class VectorStoreManager:
             'num_chunks': num_chunks,
             'transcript_length': len(transcript)
         }
+        self._save_cached_video(video_id, vector_store, result['metadata'], index_type, precision)
         
         return result
+    
+    async def process_video_async(
+        self,
+        video_url: str,
+        progress_cb: Optional[Callable[[str, int], None]] = None
+    ) -> dict:
+        """
+        Run process_video off the event loop
+        
+        Args:
+            video_url: YouTube video URL or ID
+            progress_cb: Optional callback receiving (status message, percent complete)
+            
+        Returns:
+            Dictionary with processing results
+        """
+        return await asyncio.to_thread(self.process_video, video_url, progress_cb)
+    
+    async def process_videos(self, video_urls: list, max_concurrency: int = 8) -> list:
+        """
+        Process several videos concurrently
+        
+        Args:
+            video_urls: YouTube video URLs or IDs
+            max_concurrency: Maximum number of videos processed at once
+            
+        Returns:
+            List of result dictionaries, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def process_one(video_url):
+            async with semaphore:
+                return await self.process_video_async(video_url)
+        
+        return await asyncio.gather(*[process_one(url) for url in video_urls])
 
 
 # Testing function